@@ -1,21 +1,41 @@
 import os
 import re
+import io
+import math
+import random
 import time
+from functools import lru_cache
 from pathlib import Path
 import fnmatch
-import tkinter as tk
-from tkinter import filedialog, scrolledtext, ttk, messagebox
-import socket
+
+# GUI and python-docx modules are imported on first use (see load_gui / load_docx) to keep startup fast
+tk = filedialog = scrolledtext = ttk = messagebox = None
+Document = RGBColor = None
+internet_blocked = False
 
 # Disable network access and print privacy message
 def block_internet():
+    global internet_blocked
+    if internet_blocked:
+        return
+    import socket
     print("This tool is privacy-first and has disabled internet access.")  # Prints to terminal
-    original_socket = socket.socket
     def disabled_socket(*args, **kwargs):
         raise RuntimeError("This tool is privacy-first and has disabled internet access.")
     socket.socket = disabled_socket
+    internet_blocked = True
+
+def load_gui():
+    global tk, filedialog, scrolledtext, ttk, messagebox
+    if tk is None:
+        import tkinter as tk
+        from tkinter import filedialog, scrolledtext, ttk, messagebox
 
-block_internet()  # Runs at startup
+def load_docx():
+    global Document, RGBColor
+    if Document is None:
+        from docx import Document
+        from docx.shared import RGBColor
 
 # Configuration settings
 DIR = "/path/to/your/search/directory"
@@ -32,6 +52,11 @@ MIDDLE_SENTENCES = 10
 MIDDLE_WORD_LIMIT = 150
 UPDATE_INTERVAL = 50
 DOCX_BATCH_SIZE = 1000  # Save .docx every 1000 files
+PREFLIGHT_SAMPLE_SIZE = 200  # Max files searched by the preflight estimate
+PREFLIGHT_STRATA = 4  # Size bands the preflight sample is drawn from
+PREFLIGHT_TIME_BUDGET = 5  # Seconds the preflight estimate may spend searching
+PREFLIGHT_DOCX_RECORDS = 50  # Records rendered to .docx to estimate its size when another format is chosen
+DOCX_SAVE_PASSES = 3  # Each .docx record is saved in its batch, reloaded for the merge and saved again
 RTF_HEADER = r"{\rtf1\ansi\ansicpg1252\deff0\nouicompat\deflang1033{\fonttbl{\f0\fswiss\fcharset0 Calibri;}}{\colortbl;\red255\green0\blue0;\red0\green0\blue255;}\f0\fs22\par"
 RTF_FOOTER = r"}"
 
@@ -44,6 +69,17 @@ HIGHLIGHT_STYLES = {
     "Bold Blue": r"\b \cf2 {term}\cf0\b0 "
 }
 
+# Markdown has no colors, so every highlight style renders as strong emphasis
+MARKDOWN_HIGHLIGHT = "**{term}**"
+# Backslash-escape characters that would otherwise start Markdown formatting of their own
+MARKDOWN_ESCAPES = str.maketrans({c: "\\" + c for c in "\\`*_[]<>~|#"})
+
+# Per-match record layouts; the middle block is left empty when the middle excerpt is hidden
+RTF_RECORD = "\\ul File: {file}\\ulnone\\par\n\\par\n\\cf1 (keyword excerpt):\\cf0\\par\n{keyword}\\par\n{middle}------------------------\\par\n\\par\n"
+RTF_MIDDLE = "\\par\n\\cf1 Middle of file excerpt:\\cf0\\par\n{middle}\\par\n"
+TEXT_RECORD = "File: {file}\n\n(keyword excerpt):\n{keyword}\n{middle}------------------------\n"
+TEXT_MIDDLE = "\nMiddle of file excerpt:\n{middle}\n"
+
 # Search modes
 SEARCH_MODES = ["Individual Mode", "Proximity Mode"]
 
@@ -55,6 +91,174 @@ total_matches_by_term = {}
 total_files = 0
 running = False
 
+# Compiled patterns and split highlight templates are cached for every run in the same process
+@lru_cache(maxsize=256)
+def cached_pattern(pattern, flags=0):
+    return re.compile(pattern, flags)
+
+def term_pattern(term, flags):
+    return cached_pattern(rf"(?:^|\s){re.escape(term)}(?=[,.\s]|$)", flags)
+
+@lru_cache(maxsize=None)
+def highlight_parts(template):
+    prefix, _, suffix = template.partition("{term}")
+    return prefix, suffix
+
+def rtf_escape(text):
+    return text.replace('\\', '\\\\').replace('{', '\\{').replace('}', '\\}')
+
+def markdown_escape(text):
+    return text.translate(MARKDOWN_ESCAPES)
+
+def strip_control_chars(text):
+    return ''.join(c for c in text if ord(c) >= 32 or c in '\t\n\r')
+
+# Collect every match of every pattern in one scan per pattern and merge overlapping spans.
+# Patterns match the whitespace before a term, so spans are trimmed to start at the term itself.
+def find_term_spans(text, patterns):
+    spans = []
+    for pattern in patterns:
+        for match in pattern.finditer(text):
+            matched = match.group(0)
+            start = match.start() + len(matched) - len(matched.lstrip())
+            if start < match.end():
+                spans.append((start, match.end()))
+    spans.sort()
+    merged = []
+    for start, end in spans:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return merged
+
+# Walk the text once, yielding (segment, is_highlighted) pairs in order
+def iter_segments(text, spans):
+    pos = 0
+    for start, end in spans:
+        if start > pos:
+            yield text[pos:start], False
+        yield text[start:end], True
+        pos = end
+    if pos < len(text):
+        yield text[pos:], False
+
+def render_rtf(text, spans, style):
+    prefix, suffix = highlight_parts(HIGHLIGHT_STYLES[style])
+    return "".join(prefix + rtf_escape(segment) + suffix if highlighted else rtf_escape(segment)
+                   for segment, highlighted in iter_segments(text, spans))
+
+def render_markdown(text, spans):
+    prefix, suffix = highlight_parts(MARKDOWN_HIGHLIGHT)
+    return "".join(prefix + markdown_escape(segment) + suffix if highlighted else markdown_escape(segment)
+                   for segment, highlighted in iter_segments(text, spans))
+
+def add_docx_runs(paragraph, text, spans, style):
+    for segment, highlighted in iter_segments(text, spans):
+        run = paragraph.add_run(segment)
+        if highlighted:
+            if "Bold" in style:
+                run.bold = True
+            if "Red" in style:
+                run.font.color.rgb = RGBColor(255, 0, 0)
+            elif "Blue" in style:
+                run.font.color.rgb = RGBColor(0, 0, 255)
+
+def read_source_text(file):
+    with open(file, "r", encoding="utf-8", errors="ignore") as f:
+        raw_text = f.read().replace(r'\c', r'\\c')
+    # Normalize all whitespace in source text to single spaces
+    raw_text = " ".join(raw_text.split())
+    sentences_all = cached_pattern(r'\.\s*').split(raw_text)
+    sentences_all = [s.strip() + "." for s in sentences_all if s.strip()]
+    return raw_text, sentences_all
+
+def build_middle_excerpt(raw_text, word_limit):
+    all_words = raw_text.split()
+    mid_point = len(all_words) // 2
+    half_limit = word_limit // 2
+    mid_start = max(0, mid_point - half_limit)
+    mid_end = min(len(all_words), mid_point + half_limit)
+    middle_excerpt = " ".join(all_words[mid_start:mid_end])
+    if mid_end < len(all_words):
+        middle_excerpt += "..."
+    if mid_start > 0:
+        middle_excerpt = "..." + middle_excerpt
+    return middle_excerpt
+
+def format_record(file, keyword_excerpt, middle_excerpt, output_file_type, show_middle):
+    if output_file_type == ".rtf":
+        record, middle = RTF_RECORD, RTF_MIDDLE
+    else:
+        record, middle = TEXT_RECORD, TEXT_MIDDLE
+    middle_block = middle.format(middle=middle_excerpt) if show_middle else ""
+    return record.format(file=file, keyword=keyword_excerpt, middle=middle_block)
+
+def add_docx_record(doc, file, keyword_excerpt, spans, middle_excerpt, style, show_middle):
+    p = doc.add_paragraph()
+    p.add_run(f"File: {file}", style=None).underline = True
+    p = doc.add_paragraph()
+    p.add_run("(keyword excerpt):").font.color.rgb = RGBColor(255, 0, 0)
+    p = doc.add_paragraph()
+    add_docx_runs(p, keyword_excerpt, spans, style)
+    if show_middle:
+        p = doc.add_paragraph()
+        p.add_run("Middle of file excerpt:").font.color.rgb = RGBColor(255, 0, 0)
+        doc.add_paragraph(middle_excerpt)
+    doc.add_paragraph("------------------------")
+
+def document_size(doc):
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.tell()
+
+def save_docx_subset(docx_subset):
+    if "size" not in docx_subset:
+        save_start = time.time()
+        docx_subset["size"] = document_size(docx_subset["doc"])
+        docx_subset["save_time"] = time.time() - save_start
+
+def format_bytes(size):
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}"
+        size /= 1024
+
+# Split files into equal-count size bands and draw a random sample from each, proportional to band size
+def sample_strata(files, sample_size, strata_count):
+    sized = []
+    for f in files:
+        try:
+            sized.append((f.stat().st_size, f))
+        except OSError:
+            sized.append((0, f))
+    sized.sort(key=lambda item: item[0])
+    band = math.ceil(len(sized) / strata_count)
+    strata = []
+    for start in range(0, len(sized), band):
+        members = [f for _, f in sized[start:start + band]]
+        count = max(2, round(sample_size * len(members) / len(sized)))
+        strata.append((len(members), random.sample(members, min(count, len(members)))))
+    return strata
+
+# Stratified estimate of the population total of one sampled value, with a 95% confidence interval
+def stratified_estimate(strata, key):
+    total = 0.0
+    variance = 0.0
+    for population, samples in strata:
+        n = len(samples)
+        if not n:
+            continue
+        values = [sample.get(key, 0) for sample in samples]
+        mean = sum(values) / n
+        total += population * mean
+        if n > 1:
+            sample_var = sum((v - mean) ** 2 for v in values) / (n - 1)
+            variance += population ** 2 * (1 - n / population) * sample_var / n
+    margin = 1.96 * math.sqrt(variance)
+    return total, max(0.0, total - margin), total + margin
+
 class Tooltip:
     def __init__(self, widget, text):
         self.widget = widget
@@ -82,6 +286,8 @@ class Tooltip:
 
 class SearchApp:
     def __init__(self, root):
+        load_gui()
+        block_internet()
         self.root = root
         self.root.title("Text Search Tool")
         self.search_terms = tk.StringVar(value=",".join(DEFAULT_TERMS))
@@ -164,7 +370,7 @@ class SearchApp:
         # Output Settings Section
         output_frame = ttk.LabelFrame(main_frame, text="Output Settings (RTF Output Recommended)", padding="5")
         output_frame.grid(row=3, column=0, padx=5, pady=5, sticky=(tk.W, tk.E))
-        tk.Label(output_frame, text="Highlight Style (for RTF only):").grid(row=0, column=0, pady=2, sticky=tk.W)
+        tk.Label(output_frame, text="Highlight Style (.rtf/.docx/.md):").grid(row=0, column=0, pady=2, sticky=tk.W)
         style_combo = ttk.Combobox(output_frame, textvariable=self.highlight_style, values=list(HIGHLIGHT_STYLES.keys()), state="readonly")
         style_combo.grid(row=0, column=1, pady=2, sticky=tk.W)
         style_combo.set("Bold")
@@ -176,13 +382,15 @@ class SearchApp:
         tk.Checkbutton(output_frame, variable=self.show_middle_excerpt).grid(row=2, column=1, pady=2, sticky=tk.W)
         help_output = tk.Label(output_frame, text="?", fg="blue", cursor="question_arrow")
         help_output.grid(row=0, column=2, padx=5, sticky=tk.W)
-        Tooltip(help_output, "Highlight Style: How matches appear in RTF (e.g., Bold, Red)—RTF recommended for speed.\nOutput File Type: .rtf (fast, formatted), .txt/.md (fast, plain), .docx (slower, formatted).\nShow Middle Excerpt: Include middle file context in output if checked.")
+        Tooltip(help_output, "Highlight Style: How matches appear in .rtf and .docx (e.g., Bold, Red); .md always uses **bold**—RTF recommended for speed.\nOutput File Type: .rtf (fast, highlighted), .md (fast, bold matches), .txt (fast, plain), .docx (slower, highlighted).\nShow Middle Excerpt: Include middle file context in output if checked.")
 
         # Button Section
         btn_frame = ttk.Frame(main_frame)
         btn_frame.grid(row=4, column=0, pady=10)
         self.start_btn = tk.Button(btn_frame, text="Start Search", command=self.start_search)
         self.start_btn.pack(side=tk.LEFT, padx=5)
+        self.preflight_btn = tk.Button(btn_frame, text="Preflight Estimate", command=self.preflight_estimate)
+        self.preflight_btn.pack(side=tk.LEFT, padx=5)
         self.stop_btn = tk.Button(btn_frame, text="Stop", command=self.stop_search, state=tk.DISABLED)
         self.stop_btn.pack(side=tk.LEFT, padx=5)
 
@@ -242,43 +450,66 @@ class SearchApp:
         self.root.update_idletasks()
         self.root.update()
 
+    def read_settings(self):
+        terms = [t.strip() for t in self.search_terms.get().split(',')] if self.search_terms.get() else DEFAULT_TERMS
+        flags = 0 if self.case_sensitive.get() else re.IGNORECASE
+        self.term_patterns = [term_pattern(term, flags) for term in terms]
+        mode = self.search_mode.get()
+        # Read once per run; the widgets stay editable while a search is running
+        self.search_mode_val = mode
+        self.output_file_type_val = self.output_file_type.get()
+        self.highlight_style_val = self.highlight_style.get()
+        self.show_middle_excerpt_val = self.show_middle_excerpt.get()
+
+        try:
+            self.excerpt_sentences_val = int(self.excerpt_sentences.get())
+            self.middle_word_limit_val = int(self.middle_word_limit.get())
+            self.proximity_window_val = int(self.proximity_window.get()) if mode == "Proximity Mode" else PROXIMITY_WINDOW
+        except ValueError:
+            self.excerpt_sentences_val = EXCERPT_SENTENCES
+            self.middle_word_limit_val = MIDDLE_WORD_LIMIT
+            self.proximity_window_val = PROXIMITY_WINDOW
+
+        self.ignore_files_list = [f.strip() for f in self.ignore_files.get().split(',')] if self.ignore_files.get() else IGNORE_FILES
+        self.ignore_folders_list = [f.strip() for f in self.ignore_folders.get().split(',')] if self.ignore_folders.get() else IGNORE_FOLDERS
+        return terms
+
+    def discover_files(self, search_dir):
+        txt_files = []
+        for pattern in ["*.[tT][xX][tT]", "*.[mM][dD]", "*"]:
+            files = list(Path(search_dir).rglob(pattern))
+            txt_files.extend(f for f in files if f.is_file() and (f.suffix.lower() in ['.txt', '.md'] or not f.suffix))
+        txt_files = list(set(txt_files))
+        return [f for f in txt_files
+                if not (any(fnmatch.fnmatch(f.name, ignore) for ignore in self.ignore_files_list) or
+                        any(fnmatch.fnmatch(str(f.parent.name), ignore) for ignore in self.ignore_folders_list))]
+
     def start_search(self):
         global running, start_time, files_processed, total_matches_by_term, total_files, output_files
         if running:
             return
         running = True
         self.start_btn.config(state=tk.DISABLED)
+        self.preflight_btn.config(state=tk.DISABLED)
         self.stop_btn.config(state=tk.NORMAL)
         files_processed = 0
         start_time = time.time()
 
-        terms = [t.strip() for t in self.search_terms.get().split(',')] if self.search_terms.get() else DEFAULT_TERMS
-        flags = 0 if self.case_sensitive.get() else re.IGNORECASE
-        self.term_patterns = [re.compile(rf"(?:^|\s){re.escape(term)}(?=[,.\s]|$)", flags) for term in terms]
+        terms = self.read_settings()
         total_matches_by_term = {term: 0 for term in terms} if self.search_mode.get() == "Individual Mode" else {'proximity': 0}
 
         search_dir = self.search_dir.get()
         output_dir = self.output_dir.get()
-        output_file_type = self.output_file_type.get()
+        output_file_type = self.output_file_type_val
         if output_file_type != ".rtf" and not hasattr(self, 'warned_non_rtf'):
-            self.stats_text.insert(tk.END, "Note: Only .rtf and .docx support highlighting; .docx is slower.\n")
+            self.stats_text.insert(tk.END, "Note: Only .rtf, .docx and .md support highlighting; .docx is slower.\n")
             self.warned_non_rtf = True
         self.is_rtf = output_file_type == ".rtf"
         self.is_docx = output_file_type == ".docx"
+        if self.is_docx:
+            load_docx()
         mode = self.search_mode.get()
 
-        try:
-            self.excerpt_sentences_val = int(self.excerpt_sentences.get())
-            self.middle_word_limit_val = int(self.middle_word_limit.get())
-            self.proximity_window_val = int(self.proximity_window.get()) if mode == "Proximity Mode" else PROXIMITY_WINDOW
-        except ValueError:
-            self.excerpt_sentences_val = EXCERPT_SENTENCES
-            self.middle_word_limit_val = MIDDLE_WORD_LIMIT
-            self.proximity_window_val = PROXIMITY_WINDOW
-
-        self.ignore_files_list = [f.strip() for f in self.ignore_files.get().split(',')] if self.ignore_files.get() else IGNORE_FILES
-        self.ignore_folders_list = [f.strip() for f in self.ignore_folders.get().split(',')] if self.ignore_folders.get() else IGNORE_FOLDERS
-
         if not os.path.isdir(search_dir):
             self.stats_text.insert(tk.END, f"Error: {search_dir} does not exist\n")
             self.stop_search()
@@ -294,11 +525,6 @@ class SearchApp:
                 if os.path.exists(output_file):
                     overwrite_files.append(f"{term}{output_file_type}")
                 if self.is_docx:
-                    from docx import Document
-                    from docx.oxml.ns import qn
-                    from docx.oxml import OxmlElement
-                    from docx.text.run import Run
-                    from docx.shared import RGBColor
                     output_files[term] = Document()
                 else:
                     output_files[term] = open(output_file, "w", encoding="utf-8", newline="\n")
@@ -314,11 +540,6 @@ class SearchApp:
             if os.path.exists(output_file):
                 overwrite_files.append(output_file_name)
             if self.is_docx:
-                from docx import Document
-                from docx.oxml.ns import qn
-                from docx.oxml import OxmlElement
-                from docx.text.run import Run
-                from docx.shared import RGBColor
                 output_files['proximity'] = Document()
             else:
                 output_files['proximity'] = open(output_file, "w", encoding="utf-8", newline="\n")
@@ -331,293 +552,125 @@ class SearchApp:
                 self.stop_search()
                 return
 
-        self.txt_files = []
-        for pattern in ["*.[tT][xX][tT]", "*.[mM][dD]", "*"]:
-            files = list(Path(search_dir).rglob(pattern))
-            self.txt_files.extend(f for f in files if f.is_file() and (f.suffix.lower() in ['.txt', '.md'] or not f.suffix))
-        self.txt_files = list(set(self.txt_files))
-        self.txt_files = [f for f in self.txt_files
-                          if not (any(fnmatch.fnmatch(f.name, ignore) for ignore in self.ignore_files_list) or
-                                  any(fnmatch.fnmatch(str(f.parent.name), ignore) for ignore in self.ignore_folders_list))]
+        self.txt_files = self.discover_files(search_dir)
         total_files = len(self.txt_files)
         self.docx_file_count = 0
         self.update_stats(terms)
         self.root.after(10, self.search_loop)
-        
+
+    # Yields (key, patterns, keyword_excerpt) for every match in a file. Proximity matches whose
+    # excerpt lost one of the terms are still counted, but come back with keyword_excerpt set to None.
+    def iter_file_matches(self, lines, sentences_all, terms, ignore_pattern):
+        if self.search_mode_val == "Individual Mode":
+            for i, line in enumerate(lines, 1):
+                if ignore_pattern.search(line):
+                    continue
+                for term, pattern in zip(terms, self.term_patterns):
+                    if not pattern.search(line):
+                        continue
+                    start = max(0, i - self.proximity_window_val)
+                    end = min(len(lines), i + self.proximity_window_val)
+                    excerpt_lines = [l for l in lines[start:end] if not ignore_pattern.search(l)]
+                    excerpt_full = " ".join(excerpt_lines)
+                    sentences = cached_pattern(r'\.\s*').split(excerpt_full)
+                    keyword_sentence_idx = -1
+                    for idx, sentence in enumerate(sentences):
+                        if pattern.search(sentence):
+                            keyword_sentence_idx = idx
+                            break
+                    if keyword_sentence_idx == -1:
+                        keyword_excerpt = line.strip() + "."
+                    else:
+                        excerpt_start = max(0, keyword_sentence_idx - (self.excerpt_sentences_val // 2))
+                        excerpt_end = min(len(sentences), excerpt_start + self.excerpt_sentences_val)
+                        keyword_excerpt = " ".join(sentences[excerpt_start:excerpt_end]).strip() + "."
+                        if not pattern.search(keyword_excerpt):
+                            keyword_excerpt = line.strip() + "."
+                    yield term, [pattern], keyword_excerpt
+        else:
+            proximity_matches = []
+            for i, sentence in enumerate(sentences_all):
+                if ignore_pattern.search(sentence):
+                    continue
+                if self.term_patterns[0].search(sentence):
+                    start = max(0, i - self.proximity_window_val)
+                    end = min(len(sentences_all), i + self.proximity_window_val + 1)
+                    window = " ".join(sentences_all[start:end])
+                    if all(pattern.search(window) for pattern in self.term_patterns):
+                        proximity_matches.append(i)
+
+            for match_idx in proximity_matches:
+                start = max(0, match_idx - (self.excerpt_sentences_val // 2))
+                end = min(len(sentences_all), start + self.excerpt_sentences_val)
+                keyword_excerpt = " ".join(sentences_all[start:end])
+                if not all(pattern.search(keyword_excerpt) for pattern in self.term_patterns):
+                    keyword_excerpt = None
+                yield 'proximity', self.term_patterns, keyword_excerpt
+
+    def prepare_middle_excerpt(self, raw_text, output_file_type):
+        if not self.show_middle_excerpt_val:
+            return ""
+        middle_excerpt = build_middle_excerpt(raw_text, self.middle_word_limit_val)
+        if output_file_type == ".rtf":
+            return rtf_escape(middle_excerpt)
+        if output_file_type == ".docx":
+            return strip_control_chars(middle_excerpt)
+        if output_file_type == ".md":
+            return markdown_escape(middle_excerpt)
+        return middle_excerpt
+
+    def render_excerpt(self, keyword_excerpt, patterns, output_file_type):
+        if output_file_type == ".docx":
+            keyword_excerpt = strip_control_chars(keyword_excerpt)
+        spans = find_term_spans(keyword_excerpt, patterns)
+        if output_file_type == ".rtf":
+            keyword_excerpt = render_rtf(keyword_excerpt, spans, self.highlight_style_val)
+        elif output_file_type == ".md":
+            keyword_excerpt = render_markdown(keyword_excerpt, spans)
+        return keyword_excerpt, spans
+
+    def write_match(self, key, file, keyword_excerpt, patterns, middle_excerpt, output_file_type):
+        keyword_excerpt, spans = self.render_excerpt(keyword_excerpt, patterns, output_file_type)
+        out_f = output_files[key]
+        if self.is_docx:
+            add_docx_record(out_f, file, keyword_excerpt, spans, middle_excerpt,
+                            self.highlight_style_val, self.show_middle_excerpt_val)
+            # Batch save on matches
+            if total_matches_by_term[key] % DOCX_BATCH_SIZE == 0:
+                temp_file = os.path.join(self.output_dir.get(), f"temp_{key}_{total_matches_by_term[key] // DOCX_BATCH_SIZE}.docx")
+                out_f.save(temp_file)
+                output_files[key] = Document()
+        else:
+            out_f.write(format_record(file, keyword_excerpt, middle_excerpt, output_file_type, self.show_middle_excerpt_val))
+            out_f.flush()
+
     def search_loop(self):
         global files_processed
-        ignore_pattern = re.compile(IGNORE_STRING)
-        mode = self.search_mode.get()
+        ignore_pattern = cached_pattern(IGNORE_STRING)
         terms = [t.strip() for t in self.search_terms.get().split(',')] if self.search_terms.get() else DEFAULT_TERMS
+        output_file_type = self.output_file_type_val
 
         for file in self.txt_files:
             if not running:
                 break
             file_start = time.time()
             try:
-                with open(file, "r", encoding="utf-8", errors="ignore") as f:
-                    raw_text = f.read().replace(r'\c', r'\\c')
-                    # Normalize all whitespace in source text to single spaces
-                    raw_text = " ".join(raw_text.split())
-                    lines = raw_text.splitlines()
-                    sentences_all = re.split(r'\.\s*', raw_text)
-                    sentences_all = [s.strip() + "." for s in sentences_all if s.strip()]
+                raw_text, sentences_all = read_source_text(file)
             except Exception as e:
                 self.stats_text.insert(tk.END, f"Error reading {file}: {e}\n")
                 files_processed += 1
                 continue
 
-            if mode == "Individual Mode":
-                for i, line in enumerate(lines, 1):
-                    if not running:
-                        break
-                    if ignore_pattern.search(line):
-                        continue
-                    for term_idx, pattern in enumerate(self.term_patterns):
-                        term = terms[term_idx]
-                        match = pattern.search(line)
-                        if match:
-                            total_matches_by_term[term] += 1
-                            start = max(0, i - self.proximity_window_val)
-                            end = min(len(lines), i + self.proximity_window_val)
-                            excerpt_lines = [l for l in lines[start:end] if not ignore_pattern.search(l)]
-                            excerpt_full = " ".join(excerpt_lines)
-                            sentences = re.split(r'\.\s*', excerpt_full)
-                            keyword_sentence_idx = -1
-                            for idx, sentence in enumerate(sentences):
-                                if not running:
-                                    break
-                                if pattern.search(sentence):
-                                    keyword_sentence_idx = idx
-                                    break
-                            if keyword_sentence_idx == -1:
-                                keyword_excerpt = line.strip() + "."
-                            else:
-                                excerpt_start = max(0, keyword_sentence_idx - (self.excerpt_sentences_val // 2))
-                                excerpt_end = min(len(sentences), excerpt_start + self.excerpt_sentences_val)
-                                keyword_excerpt = " ".join(sentences[excerpt_start:excerpt_end]).strip() + "."
-                                if not pattern.search(keyword_excerpt):
-                                    keyword_excerpt = line.strip() + "."
-                            matched_term = match.group(0)
-                            if self.is_rtf:
-                                keyword_excerpt = keyword_excerpt.replace('\\', '\\\\').replace('{', '\\{').replace('}', '\\}')
-                                style = self.highlight_style.get()
-                                highlighted_term = HIGHLIGHT_STYLES[style].format(term=matched_term)
-                                excerpt_match = pattern.search(keyword_excerpt)
-                                if excerpt_match:
-                                    start_pos = excerpt_match.start()
-                                    end_pos = excerpt_match.end()
-                                    keyword_excerpt = (
-                                        keyword_excerpt[:start_pos] +
-                                        highlighted_term +
-                                        keyword_excerpt[end_pos:]
-                                    )
-
-                            middle_excerpt = ""
-                            if self.show_middle_excerpt.get():
-                                all_words = raw_text.split()
-                                mid_point = len(all_words) // 2
-                                half_limit = self.middle_word_limit_val // 2
-                                mid_start = max(0, mid_point - half_limit)
-                                mid_end = min(len(all_words), mid_point + half_limit)
-                                middle_words = all_words[mid_start:mid_end]
-                                middle_excerpt = " ".join(middle_words)
-                                if mid_end < len(all_words):
-                                    middle_excerpt += "..."
-                                if mid_start > 0:
-                                    middle_excerpt = "..." + middle_excerpt
-                                if self.is_rtf:
-                                    middle_excerpt = middle_excerpt.replace('\\', '\\\\').replace('{', '\\{').replace('}', '\\}')
-
-                            out_f = output_files[term]
-                            if self.is_docx:
-                                from docx.shared import RGBColor
-                                keyword_excerpt = ''.join(c for c in keyword_excerpt if ord(c) >= 32 or c in '\t\n\r')
-                                middle_excerpt = ''.join(c for c in middle_excerpt if ord(c) >= 32 or c in '\t\n\r')
-                                p = out_f.add_paragraph()
-                                p.add_run(f"File: {file}", style=None).underline = True
-                                p = out_f.add_paragraph()
-                                p.add_run("(keyword excerpt):").font.color.rgb = RGBColor(255, 0, 0)
-                                p = out_f.add_paragraph()
-                                match = pattern.search(keyword_excerpt)
-                                if match:
-                                    start, end = match.start(), match.end()
-                                    pre_text = keyword_excerpt[:start]
-                                    matched_term = keyword_excerpt[start:end]
-                                    post_text = keyword_excerpt[end:]
-                                    if pre_text:
-                                        p.add_run(pre_text)
-                                    run = p.add_run(matched_term)
-                                    style = self.highlight_style.get()
-                                    if "Bold" in style:
-                                        run.bold = True
-                                    if "Red" in style:
-                                        run.font.color.rgb = RGBColor(255, 0, 0)
-                                    elif "Blue" in style:
-                                        run.font.color.rgb = RGBColor(0, 0, 255)
-                                    if post_text:
-                                        p.add_run(post_text)
-                                else:
-                                    p.add_run(keyword_excerpt)
-                                if self.show_middle_excerpt.get():
-                                    p = out_f.add_paragraph()
-                                    p.add_run("Middle of file excerpt:").font.color.rgb = RGBColor(255, 0, 0)
-                                    out_f.add_paragraph(middle_excerpt)
-                                out_f.add_paragraph("------------------------")
-                                # Batch save on matches
-                                if total_matches_by_term[term] % DOCX_BATCH_SIZE == 0:
-                                    from docx import Document
-                                    temp_file = os.path.join(self.output_dir.get(), f"temp_{term}_{total_matches_by_term[term] // DOCX_BATCH_SIZE}.docx")
-                                    out_f.save(temp_file)
-                                    output_files[term] = Document()
-                            elif self.is_rtf:
-                                out_f.write(f"\\ul File: {file}\\ulnone\\par\n")
-                                out_f.write("\\par\n")
-                                out_f.write(f"\\cf1 (keyword excerpt):\\cf0\\par\n")
-                                out_f.write(f"{keyword_excerpt}\\par\n")
-                                if self.show_middle_excerpt.get():
-                                    out_f.write("\\par\n")
-                                    out_f.write(f"\\cf1 Middle of file excerpt:\\cf0\\par\n")
-                                    out_f.write(f"{middle_excerpt}\\par\n")
-                                out_f.write("------------------------\\par\n")
-                                out_f.write("\\par\n")
-                            else:
-                                out_f.write(f"File: {file}\n")
-                                out_f.write("\n")
-                                out_f.write(f"(keyword excerpt):\n")
-                                out_f.write(f"{keyword_excerpt}\n")
-                                if self.show_middle_excerpt.get():
-                                    out_f.write("\n")
-                                    out_f.write(f"Middle of file excerpt:\n")
-                                    out_f.write(f"{middle_excerpt}\n")
-                                out_f.write("------------------------\n")
-                            if not self.is_docx:
-                                out_f.flush()
-            else:
-                proximity_matches = []
-                for i, sentence in enumerate(sentences_all):
-                    if not running:
-                        break
-                    if ignore_pattern.search(sentence):
-                        continue
-                    if self.term_patterns[0].search(sentence):
-                        start = max(0, i - self.proximity_window_val)
-                        end = min(len(sentences_all), i + self.proximity_window_val + 1)
-                        window = " ".join(sentences_all[start:end])
-                        if all(pattern.search(window) for pattern in self.term_patterns):
-                            proximity_matches.append(i)
-
-                for match_idx in proximity_matches:
-                    if not running:
-                        break
-                    total_matches_by_term['proximity'] += 1
-                    start = max(0, match_idx - (self.excerpt_sentences_val // 2))
-                    end = min(len(sentences_all), start + self.excerpt_sentences_val)
-                    excerpt_sentences_list = sentences_all[start:end]
-                    keyword_excerpt = " ".join(excerpt_sentences_list)
-
-                    if not all(pattern.search(keyword_excerpt) for pattern in self.term_patterns):
-                        continue
-
-                    if self.is_rtf:
-                        keyword_excerpt = keyword_excerpt.replace('\\', '\\\\').replace('{', '\\{').replace('}', '\\}')
-                        style = self.highlight_style.get()
-                        for pattern_idx, pattern in enumerate(self.term_patterns):
-                            matches = list(pattern.finditer(keyword_excerpt))
-                            for match in reversed(matches):
-                                if not running:
-                                    break
-                                matched_term = match.group(0)
-                                highlighted_term = HIGHLIGHT_STYLES[style].format(term=matched_term)
-                                keyword_excerpt = (
-                                    keyword_excerpt[:match.start()] +
-                                    highlighted_term +
-                                    keyword_excerpt[match.end():]
-                                )
-
-                    middle_excerpt = ""
-                    if self.show_middle_excerpt.get():
-                        all_words = raw_text.split()
-                        mid_point = len(all_words) // 2
-                        half_limit = self.middle_word_limit_val // 2
-                        mid_start = max(0, mid_point - half_limit)
-                        mid_end = min(len(all_words), mid_point + half_limit)
-                        middle_words = all_words[mid_start:mid_end]
-                        middle_excerpt = " ".join(middle_words)
-                        if mid_end < len(all_words):
-                            middle_excerpt += "..."
-                        if mid_start > 0:
-                            middle_excerpt = "..." + middle_excerpt
-                        if self.is_rtf:
-                            middle_excerpt = middle_excerpt.replace('\\', '\\\\').replace('{', '\\{').replace('}', '\\}')
-
-                    out_f = output_files['proximity']
-                    if self.is_docx:
-                        from docx.shared import RGBColor
-                        keyword_excerpt = ''.join(c for c in keyword_excerpt if ord(c) >= 32 or c in '\t\n\r')
-                        middle_excerpt = ''.join(c for c in middle_excerpt if ord(c) >= 32 or c in '\t\n\r')
-                        p = out_f.add_paragraph()
-                        p.add_run(f"File: {file}", style=None).underline = True
-                        p = out_f.add_paragraph()
-                        p.add_run("(keyword excerpt):").font.color.rgb = RGBColor(255, 0, 0)
-                        p = out_f.add_paragraph()
-                        current_text = keyword_excerpt
-                        style = self.highlight_style.get()
-                        for pattern in self.term_patterns:
-                            match = pattern.search(current_text)
-                            if match:
-                                start, end = match.start(), match.end()
-                                pre_text = current_text[:start]
-                                matched_term = current_text[start:end]
-                                post_text = current_text[end:]
-                                if pre_text:
-                                    p.add_run(pre_text)
-                                run = p.add_run(matched_term)
-                                if "Bold" in style:
-                                    run.bold = True
-                                if "Red" in style:
-                                    run.font.color.rgb = RGBColor(255, 0, 0)
-                                elif "Blue" in style:
-                                    run.font.color.rgb = RGBColor(0, 0, 255)
-                                current_text = post_text
-                            else:
-                                break
-                        if current_text:
-                            p.add_run(current_text)
-                        if self.show_middle_excerpt.get():
-                            p = out_f.add_paragraph()
-                            p.add_run("Middle of file excerpt:").font.color.rgb = RGBColor(255, 0, 0)
-                            out_f.add_paragraph(middle_excerpt)
-                        out_f.add_paragraph("------------------------")
-                        # Batch save on matches
-                        if total_matches_by_term['proximity'] % DOCX_BATCH_SIZE == 0:
-                            from docx import Document
-                            temp_file = os.path.join(self.output_dir.get(), f"temp_proximity_{total_matches_by_term['proximity'] // DOCX_BATCH_SIZE}.docx")
-                            out_f.save(temp_file)
-                            output_files['proximity'] = Document()
-                    elif self.is_rtf:
-                        out_f.write(f"\\ul File: {file}\\ulnone\\par\n")
-                        out_f.write("\\par\n")
-                        out_f.write(f"\\cf1 (keyword excerpt):\\cf0\\par\n")
-                        out_f.write(f"{keyword_excerpt}\\par\n")
-                        if self.show_middle_excerpt.get():
-                            out_f.write("\\par\n")
-                            out_f.write(f"\\cf1 Middle of file excerpt:\\cf0\\par\n")
-                            out_f.write(f"{middle_excerpt}\\par\n")
-                        out_f.write("------------------------\\par\n")
-                        out_f.write("\\par\n")
-                    else:
-                        out_f.write(f"File: {file}\n")
-                        out_f.write("\n")
-                        out_f.write(f"(keyword excerpt):\n")
-                        out_f.write(f"{keyword_excerpt}\n")
-                        if self.show_middle_excerpt.get():
-                            out_f.write("\n")
-                            out_f.write(f"Middle of file excerpt:\n")
-                            out_f.write(f"{middle_excerpt}\n")
-                        out_f.write("------------------------\n")
-                    if not self.is_docx:
-                        out_f.flush()
+            middle_excerpt = None
+            for key, patterns, keyword_excerpt in self.iter_file_matches(raw_text.splitlines(), sentences_all, terms, ignore_pattern):
+                if not running:
+                    break
+                total_matches_by_term[key] += 1
+                if keyword_excerpt is None:
+                    continue
+                if middle_excerpt is None:
+                    middle_excerpt = self.prepare_middle_excerpt(raw_text, output_file_type)
+                self.write_match(key, file, keyword_excerpt, patterns, middle_excerpt, output_file_type)
 
             files_processed += 1
             if files_processed % UPDATE_INTERVAL == 0:
@@ -630,19 +683,158 @@ class SearchApp:
 
         self.finalize_search(terms)
 
+    # Search one preflight sample file the way search_loop would, without writing output.
+    # Returns the time spent on the chosen format, the number of records written, and match counts and
+    # output bytes under ("matches", key) and ("bytes", fmt) so search terms can't collide with other values.
+    def measure_file(self, file, terms, ignore_pattern, output_file_type, render_doc, docx_subset):
+        file_start = time.time()
+        try:
+            raw_text, sentences_all = read_source_text(file)
+        except Exception:
+            return {"time": time.time() - file_start}
+        matches = list(self.iter_file_matches(raw_text.splitlines(), sentences_all, terms, ignore_pattern))
+        written = [(key, patterns, keyword_excerpt) for key, patterns, keyword_excerpt in matches if keyword_excerpt is not None]
+        sample = {"records": len(written)}
+        txt_sizes = []
+        # .docx is only rendered in full when it is the chosen format; otherwise its size comes from docx_subset
+        formats = [output_file_type] + [fmt for fmt in OUTPUT_FILE_TYPES if fmt not in (output_file_type, ".docx")]
+        for fmt in formats:
+            if fmt == ".docx" and render_doc is None:
+                continue
+            middle_excerpt = self.prepare_middle_excerpt(raw_text, fmt) if written else ""
+            size = 0
+            for key, patterns, keyword_excerpt in written:
+                keyword_excerpt, spans = self.render_excerpt(keyword_excerpt, patterns, fmt)
+                if fmt == ".docx":
+                    add_docx_record(render_doc, file, keyword_excerpt, spans, middle_excerpt,
+                                    self.highlight_style_val, self.show_middle_excerpt_val)
+                else:
+                    record_size = len(format_record(file, keyword_excerpt, middle_excerpt, fmt, self.show_middle_excerpt_val).encode("utf-8"))
+                    size += record_size
+                    if fmt == ".txt":
+                        txt_sizes.append(record_size)
+            if fmt != ".docx":
+                sample[("bytes", fmt)] = size
+            if fmt == output_file_type:
+                sample["time"] = time.time() - file_start
+        for key, _, _ in matches:
+            sample[("matches", key)] = sample.get(("matches", key), 0) + 1
+        if docx_subset is not None and docx_subset["records"] < PREFLIGHT_DOCX_RECORDS:
+            self.add_docx_subset(docx_subset, file, raw_text, written, txt_sizes)
+        return sample
+
+    # Render a small fixed number of records into a separate document; its saved size per .txt byte and its
+    # save time per record stand in for the full .docx output
+    def add_docx_subset(self, docx_subset, file, raw_text, written, txt_sizes):
+        middle_excerpt = self.prepare_middle_excerpt(raw_text, ".docx")
+        for (key, patterns, keyword_excerpt), txt_size in zip(written, txt_sizes):
+            if docx_subset["records"] >= PREFLIGHT_DOCX_RECORDS:
+                break
+            keyword_excerpt, spans = self.render_excerpt(keyword_excerpt, patterns, ".docx")
+            add_docx_record(docx_subset["doc"], file, keyword_excerpt, spans, middle_excerpt,
+                            self.highlight_style_val, self.show_middle_excerpt_val)
+            docx_subset["records"] += 1
+            docx_subset["txt_bytes"] += txt_size
+        if docx_subset["records"] >= PREFLIGHT_DOCX_RECORDS:
+            save_docx_subset(docx_subset)
+
+    def preflight_estimate(self):
+        if running:
+            return
+        terms = self.read_settings()
+        mode = self.search_mode_val
+        search_dir = self.search_dir.get()
+        output_file_type = self.output_file_type_val
+        if not os.path.isdir(search_dir):
+            self.stats_text.insert(tk.END, f"Error: {search_dir} does not exist\n")
+            return
+        if mode == "Proximity Mode" and len(terms) < 2:
+            self.stats_text.insert(tk.END, "Error: Proximity Mode requires at least 2 terms\n")
+            return
+
+        preflight_start = time.time()
+        files = self.discover_files(search_dir)
+        if not files:
+            self.stats_text.insert(tk.END, f"Preflight: no searchable files found in {search_dir}\n")
+            return
+        self.stats_text.insert(tk.END, f"Preflight: sampling {len(files)} files...\n")
+        self.root.update()
+
+        try:
+            load_docx()
+            docx_subset = {"doc": Document(), "records": 0, "txt_bytes": 0}
+            save_start = time.time()
+            empty_size = document_size(Document())
+            empty_save_time = time.time() - save_start
+        except ImportError:
+            docx_subset = None
+        render_doc = Document() if output_file_type == ".docx" and docx_subset is not None else None
+
+        ignore_pattern = cached_pattern(IGNORE_STRING)
+        strata = sample_strata(files, PREFLIGHT_SAMPLE_SIZE, PREFLIGHT_STRATA)
+        results = [(population, []) for population, _ in strata]
+        # Visit the strata round-robin so every size band is represented before the time budget runs out
+        over_budget = False
+        for round_idx in range(max(len(sample) for _, sample in strata)):
+            for (_, sample), (_, measured) in zip(strata, results):
+                over_budget = round_idx > 0 and time.time() - preflight_start > PREFLIGHT_TIME_BUDGET
+                if over_budget:
+                    break
+                if round_idx < len(sample):
+                    measured.append(self.measure_file(sample[round_idx], terms, ignore_pattern, output_file_type, render_doc, docx_subset))
+            if over_budget:
+                break
+        if docx_subset is not None:
+            save_docx_subset(docx_subset)
+        sampled = sum(len(measured) for _, measured in results)
+
+        self.stats_text.insert(tk.END, f"Preflight Estimate ({sampled}/{len(files)} files sampled in {time.time() - preflight_start:.2f} sec, 95% CI):\n")
+        keys = terms if mode == "Individual Mode" else ['proximity']
+        for key in keys:
+            total, low, high = stratified_estimate(results, ("matches", key))
+            label = f"Matches for {key}" if mode == "Individual Mode" else "Proximity Matches"
+            self.stats_text.insert(tk.END, f"Est. {label}: {total:.0f} ({low:.0f} - {high:.0f})\n")
+        for fmt in OUTPUT_FILE_TYPES:
+            if fmt == ".docx":
+                continue
+            total, low, high = stratified_estimate(results, ("bytes", fmt))
+            self.stats_text.insert(tk.END, f"Est. Output Size ({fmt}): {format_bytes(total)} ({format_bytes(low)} - {format_bytes(high)})\n")
+        if docx_subset is None:
+            self.stats_text.insert(tk.END, "Est. Output Size (.docx): N/A (requires 'pip install python-docx')\n")
+        else:
+            # A single ratio from a few records has unknown spread, so no interval is claimed for .docx
+            subset_records = docx_subset["records"]
+            ratio = (docx_subset["size"] - empty_size) / docx_subset["txt_bytes"] if docx_subset["txt_bytes"] else 0
+            total, _, _ = stratified_estimate(results, ("bytes", ".txt"))
+            self.stats_text.insert(tk.END, f"Est. Output Size (.docx): ~{format_bytes(total * ratio)} (rough, scaled from {subset_records} sampled records, no CI)\n")
+        if output_file_type == ".docx" and docx_subset is None:
+            self.stats_text.insert(tk.END, "Est. Run Time (sec): N/A (requires 'pip install python-docx')\n")
+        else:
+            total, low, high = stratified_estimate(results, "time")
+            if output_file_type == ".docx":
+                # Batch saves and the final merge dominate .docx runs: every batch pays a fixed save cost
+                # plus a per-record cost, and each record goes through DOCX_SAVE_PASSES saves or loads
+                subset_records = docx_subset["records"]
+                per_record = max(0.0, docx_subset["save_time"] - empty_save_time) / subset_records if subset_records else 0
+                save_costs = [DOCX_SAVE_PASSES * (records * per_record + (records / DOCX_BATCH_SIZE + len(keys)) * empty_save_time)
+                              for records in stratified_estimate(results, "records")]
+                total, low, high = total + save_costs[0], low + save_costs[1], high + save_costs[2]
+            self.stats_text.insert(tk.END, f"Est. Run Time (sec): {total:.2f} ({low:.2f} - {high:.2f})\n")
+        self.stats_text.see(tk.END)
+
     def stop_search(self):
         global running
         if running:
             running = False
             self.stats_text.insert(tk.END, "Stopping search...\n")
         self.start_btn.config(state=tk.NORMAL)
+        self.preflight_btn.config(state=tk.NORMAL)
         self.stop_btn.config(state=tk.DISABLED)
 
     def finalize_search(self, terms):
         global output_files, running
         mode = self.search_mode.get()
         if self.is_docx:
-            from docx import Document
             # Save and merge all in-memory batches
             for key, f in list(output_files.items()):
                 if f:
@@ -682,9 +874,12 @@ class SearchApp:
         else:
             self.stats_text.insert(tk.END, "\nSearch Stopped by User\n")
         self.start_btn.config(state=tk.NORMAL)
+        self.preflight_btn.config(state=tk.NORMAL)
         self.stop_btn.config(state=tk.DISABLED)
         
 if __name__ == "__main__":
+    block_internet()  # Runs at startup
+    load_gui()
     root = tk.Tk()
     app = SearchApp(root)
     try:
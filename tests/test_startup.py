@@ -0,0 +1,43 @@
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFERRED_MODULES = ["tkinter", "docx", "socket"]
+# Standard library modules search_gui imports at startup, timed on their own as the baseline
+BASELINE_IMPORT = "import os, re, io, math, random, time, functools, pathlib, fnmatch"
+# search_gui may take at most this multiple of the baseline; an eager python-docx import alone is several times it
+MAX_IMPORT_RATIO = 2
+RUNS = 3
+
+
+# Returns (name, cumulative microseconds, is_top_level) for every module imported by the code
+def import_trace(code):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    trace = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            trace.append((name.strip(), int(cumulative), not name[1:].startswith(" ")))
+    return trace
+
+
+def test_import_defers_gui_docx_and_socket():
+    imported = [name for name, _, _ in import_trace("import search_gui")]
+    for module in DEFERRED_MODULES:
+        loaded = [name for name in imported if name == module or name.startswith(module + ".")]
+        assert not loaded, f"importing search_gui loaded {loaded}"
+
+
+def test_import_time_stays_near_stdlib_baseline():
+    # Take the fastest of a few runs to keep scheduling noise out of the comparison
+    own = min(cumulative for _ in range(RUNS)
+              for name, cumulative, _ in import_trace("import search_gui") if name == "search_gui")
+    baseline = min(sum(cumulative for _, cumulative, top_level in import_trace(BASELINE_IMPORT) if top_level)
+                   for _ in range(RUNS))
+    assert own < MAX_IMPORT_RATIO * baseline, f"search_gui imported in {own} us, baseline {baseline} us"